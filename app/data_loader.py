@@ -0,0 +1,145 @@
+import os
+import tempfile
+import streamlit as st
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+# ---- DATA LOADING (shared by every page) ----
+DATA_PATH = Path(__file__).parent / "data" / "data.csv"
+# Bump whenever the loader's output changes (columns, dtypes, categories) so a
+# stale sidecar from an older version is never served
+PARQUET_VERSION = 1
+PARQUET_PATH = DATA_PATH.with_name(f"data.v{PARQUET_VERSION}.parquet")
+
+EXPECTED_COLS = [
+    "run_id", "task_id", "task_label", "model",
+    "model_size", "quality", "latency_s",
+    "energy_wh", "co2_g"
+]
+
+NUM_COLS = ["quality", "latency_s", "energy_wh", "co2_g"]
+
+# task_id ranges (upper bound inclusive) -> task category, attached once here
+TASK_CATEGORY_BINS = [0, 10, 15, 20, 25, 30, np.inf]
+TASK_CATEGORIES = [
+    "Easy factual & rewriting",
+    "Reasoning & quantitative",
+    "Programming & debugging",
+    "Harder knowledge & reasoning",
+    "Advanced / creative & multi-step",
+    "Other"
+]
+
+
+def write_sidecar(df: pd.DataFrame) -> None:
+    # Optional cache: written to a temp file, then swapped in atomically so a
+    # crash or a concurrent writer never leaves a truncated sidecar behind
+    tmp = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=PARQUET_PATH.parent, prefix=PARQUET_PATH.name + ".", suffix=".tmp", delete=False
+        ) as f:
+            tmp = Path(f.name)
+        df.to_parquet(tmp, compression="zstd", index=False)
+        os.replace(tmp, PARQUET_PATH)
+    except Exception:
+        # read-only deployment or pyarrow error: keep parsing the CSV
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+
+
+@st.cache_data
+def load_data() -> pd.DataFrame:
+    if DATA_PATH.exists():
+        # Columnar sidecar of the parsed CSV, rebuilt when data.csv is newer
+        try:
+            if PARQUET_PATH.exists() and PARQUET_PATH.stat().st_mtime >= DATA_PATH.stat().st_mtime:
+                return pd.read_parquet(PARQUET_PATH)
+        except Exception:
+            try:
+                PARQUET_PATH.unlink(missing_ok=True)  # unreadable: rebuild from the CSV
+            except OSError:
+                pass
+
+        try:
+            df = pd.read_csv(
+                DATA_PATH,
+                sep=";",
+                quotechar='"',
+                decimal=",",
+                engine="pyarrow",
+                encoding="utf-8-sig",
+                dtype={
+                    "run_id": "int32",
+                    "task_id": "int16",
+                    "model": "category",
+                    "model_size": "category",
+                    "task_label": "category"
+                }
+            )
+            df.columns = df.columns.str.strip().str.lower()
+            df.rename(columns={"co_g": "co2_g"}, inplace=True)
+            df = df.drop(columns=[c for c in df.columns if c not in EXPECTED_COLS])
+
+            # Numeric columns conversion (pyarrow already infers clean columns),
+            # stored as float32 since the metrics are shown with 2-3 decimals
+            for col in NUM_COLS:
+                if col in df.columns:
+                    if not pd.api.types.is_numeric_dtype(df[col]):
+                        df[col] = pd.to_numeric(df[col], errors="coerce")
+                    df[col] = df[col].astype("float32")
+
+            # Task category (vectorized, cached with the data)
+            if "task_id" in df.columns:
+                df["task_category"] = pd.cut(
+                    df["task_id"], bins=TASK_CATEGORY_BINS, labels=TASK_CATEGORIES
+                ).fillna("Other")  # task_id <= 0 falls below the first bin
+
+            # Low-cardinality labels as categoricals (groupby keys on int codes)
+            for col in ("model", "model_size", "task_label", "task_category"):
+                if col in df.columns:
+                    df[col] = df[col].astype("category")
+
+            # Expected columns check
+            missing = [c for c in EXPECTED_COLS if c not in df.columns]
+            if missing:
+                st.error(f" Missing columns in CSV: {missing}")
+            else:
+                write_sidecar(df)
+
+            return df
+
+        except Exception as e:
+            st.error(f"Error while reading CSV: {e}")
+            return pd.DataFrame()
+    else:
+        st.warning("⚠️ No data.csv file found in app/data/.")
+        return pd.DataFrame()
+
+
+# ---- FILTERING ----
+def isin_codes(col: pd.Series, values) -> np.ndarray:
+    # Membership test on the categorical int codes instead of the labels
+    codes = col.cat.categories.get_indexer(list(values))
+    return np.isin(col.cat.codes.to_numpy(), codes[codes >= 0])
+
+
+def selection_mask(df: pd.DataFrame, size_sel, cat_sel, model_sel) -> np.ndarray:
+    mask = isin_codes(df["model_size"], size_sel)
+    mask &= isin_codes(df["task_category"], cat_sel)
+    mask &= isin_codes(df["model"], model_sel)
+    return mask
+
+
+# ---- SIDEBAR OPTIONS ----
+@st.cache_data
+def option_lookup() -> pd.DataFrame:
+    # One row per (size, category, model) combination: drives the cascading filters
+    data = load_data()
+    return data[["model_size", "task_category", "model"]].drop_duplicates().reset_index(drop=True)
+
+
+def observed_options(col: pd.Series) -> list:
+    # Labels present in a categorical column, in category order
+    return col.cat.remove_unused_categories().cat.categories.tolist()
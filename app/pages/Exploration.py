@@ -1,9 +1,12 @@
 import streamlit as st 
 import pandas as pd
 import plotly.express as px
-from pathlib import Path
+import plotly.io as pio
+
+from data_loader import load_data, option_lookup, observed_options, selection_mask
 
 # ---- CONFIG ----
+pio.json.config.default_engine = "orjson"  # faster figure serialization
 st.set_page_config(
     page_title="ComparIA – Metrics Exploration",
     page_icon="📈",
@@ -29,48 +32,25 @@ st.caption("Explore relationships between model performance metrics: quality, en
 st.divider()
 
 # ---- DATA LOADING ----
-DATA_PATH = Path(__file__).parent.parent / "data" / "data.csv"
-
-@st.cache_data
-def load_data():
-    if DATA_PATH.exists():
-        try:
-            df = pd.read_csv(DATA_PATH, sep=";", encoding="utf-8-sig")
-            df.columns = df.columns.str.strip().str.lower()
-            df.rename(columns={"co_g": "co2_g"}, inplace=True)
-
-            # Convert numeric fields
-            for col in ["quality", "latency_s", "energy_wh", "co2_g"]:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce")
-
-            return df
-        except Exception as e:
-            st.error(f"Error reading CSV: {e}")
-            return pd.DataFrame()
-    else:
-        st.warning("⚠️ No data.csv found in app/data/.")
-        return pd.DataFrame()
-
 df = load_data()
 
-# ---- TASK CATEGORY ----
-def categorize_task(task_id):
-    if 1 <= task_id <= 10:
-        return "Easy factual & rewriting"
-    elif 11 <= task_id <= 15:
-        return "Reasoning & quantitative"
-    elif 16 <= task_id <= 20:
-        return "Programming & debugging"
-    elif 21 <= task_id <= 25:
-        return "Harder knowledge & reasoning"
-    elif 26 <= task_id <= 30:
-        return "Advanced / creative & multi-step"
-    else:
-        return "Other"
+# ---- CHARTS ----
+MAX_LINE_POINTS = 200
 
-if not df.empty and "task_id" in df.columns:
-    df["task_category"] = df["task_id"].apply(categorize_task)
+@st.cache_resource(max_entries=64)
+def build_line(agg_hash: int, y: str, title: str, _df_agg: pd.DataFrame):
+    # _df_agg is not hashed by Streamlit; agg_hash identifies its content
+    fig = px.line(
+        _df_agg,
+        x="quality",
+        y=y,
+        color="model_size",
+        markers=True,
+        hover_data=["model"],
+        title=title
+    )
+    fig.update_traces(line=dict(width=3), marker=dict(size=8))
+    return fig
 
 # ---- SIDEBAR FILTERS ----
 st.sidebar.header("⚙️ Filters")
@@ -79,32 +59,28 @@ if df.empty:
     st.warning("⚠️ No data available. Please check your data.csv file.")
     st.stop()
 else:
+    lookup = option_lookup()
+
     # 1️⃣ Model sizes
-    sizes_all = sorted(df["model_size"].dropna().unique())
+    sizes_all = observed_options(lookup["model_size"])
     size_sel = st.sidebar.multiselect("Model sizes", sizes_all, default=sizes_all)
 
     if len(size_sel) == 0:
         st.sidebar.warning("Select at least one model size.")
         df_filtered = df.iloc[0:0]
     else:
-        df_size = df[df["model_size"].isin(size_sel)]
-
         # 2️⃣ Task categories
-        cats_all = sorted(df_size["task_category"].dropna().unique())
+        lookup_size = lookup[lookup["model_size"].isin(size_sel)]
+        cats_all = observed_options(lookup_size["task_category"])
         cat_sel = st.sidebar.multiselect("Task categories", cats_all, default=cats_all)
 
-        df_size_cat = df_size[df_size["task_category"].isin(cat_sel)] if len(cat_sel) else df_size.iloc[0:0]
-
         # 3️⃣ Models
-        models_all = sorted(df_size_cat["model"].dropna().unique())
+        lookup_size_cat = lookup_size[lookup_size["task_category"].isin(cat_sel)]
+        models_all = sorted(observed_options(lookup_size_cat["model"]))
         model_sel = st.sidebar.multiselect("Models", models_all, default=models_all)
 
         # 🔹 Final filter
-        df_filtered = df[
-            df["model_size"].isin(size_sel)
-            & df["task_category"].isin(cat_sel)
-            & df["model"].isin(model_sel)
-        ]
+        df_filtered = df[selection_mask(df, size_sel, cat_sel, model_sel)]
 
 # ---- VISUALIZATIONS ----
 if not df_filtered.empty:
@@ -112,7 +88,7 @@ if not df_filtered.empty:
 
     # Aggregate by model
     df_agg = (
-        df_filtered.groupby(["model", "model_size"], as_index=False)
+        df_filtered.groupby(["model", "model_size"], as_index=False, observed=True)
         .agg({
             "quality": "mean",
             "energy_wh": "mean",
@@ -121,6 +97,10 @@ if not df_filtered.empty:
         })
         .round(3)
     )
+    # Line charts are unreadable beyond a few hundred points
+    if len(df_agg) > MAX_LINE_POINTS:
+        df_agg = df_agg.nlargest(MAX_LINE_POINTS, "quality")
+    agg_hash = int(pd.util.hash_pandas_object(df_agg).sum())
 
     # --- 1ère ligne : deux graphiques côte à côte ---
     col1, col2 = st.columns(2)
@@ -128,37 +108,19 @@ if not df_filtered.empty:
     # --- 1️⃣ Quality vs Energy (line chart)
     with col1:
         st.markdown("### ⚡ Quality vs Energy Consumption (wh)")
-        fig_qe = px.line(
-            df_agg,
-            x="quality",
-            y="energy_wh",
-            color="model_size",
-            markers=True,
-            hover_data=["model"],
-            title="Average Quality vs Energy Consumption"
-        )
-        fig_qe.update_traces(line=dict(width=3), marker=dict(size=8))
+        fig_qe = build_line(agg_hash, "energy_wh", "Average Quality vs Energy Consumption", df_agg)
         st.plotly_chart(fig_qe, use_container_width=True)
 
     # --- 2️⃣ Quality vs CO2 (line chart)
     with col2:
         st.markdown("### 🌍 Quality vs CO₂ Emissions (g eq.)")
-        fig_qc = px.line(
-            df_agg,
-            x="quality",
-            y="co2_g",
-            color="model_size",
-            markers=True,
-            hover_data=["model"],
-            title="Average Quality vs CO₂ Emissions"
-        )
-        fig_qc.update_traces(line=dict(width=3), marker=dict(size=8))
+        fig_qc = build_line(agg_hash, "co2_g", "Average Quality vs CO₂ Emissions", df_agg)
         st.plotly_chart(fig_qc, use_container_width=True)
 
     # --- 2e ligne : latence centrée ---
     st.markdown("### ⏱️ Average Latency by Model Size")
     df_lat = (
-        df_filtered.groupby("model_size", as_index=False)
+        df_filtered.groupby("model_size", as_index=False, observed=True)
         .agg({"latency_s": "mean"})
         .round(2)
     )
@@ -167,10 +129,10 @@ if not df_filtered.empty:
         x="model_size",
         y="latency_s",
         color="model_size",
-        text_auto=".2f",
         title="Average Latency (s) per Model Size"
     )
-    fig_latency.update_traces(textfont_size=12)
+    # Labels formatted client-side from the raw values
+    fig_latency.update_traces(texttemplate="%{y:.2f}", textposition="outside", textfont_size=12)
     st.plotly_chart(fig_latency, use_container_width=True)
 
 else:
@@ -2,9 +2,12 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
-from pathlib import Path
+import plotly.io as pio
+
+from data_loader import load_data
 
 # ---- CONFIG ----
+pio.json.config.default_engine = "orjson"  # faster figure serialization
 st.set_page_config(page_title="🏁 Model Ranking by Use Case", page_icon="🏁", layout="wide")
 
 # ---- STYLE ----
@@ -26,62 +29,34 @@ st.caption("Ranking of models by task category based on a weighted score (qualit
 st.divider()
 
 # ---- DATA LOADING ----
-DATA_PATH = Path(__file__).parent.parent / "data" / "data.csv"
-
-@st.cache_data
-def load_data():
-    if DATA_PATH.exists():
-        try:
-            df = pd.read_csv(DATA_PATH, sep=";", encoding="utf-8-sig")
-            df.columns = df.columns.str.strip().str.lower()
-            df.rename(columns={"co_g": "co2_g"}, inplace=True)
-            for col in ["quality", "latency_s", "energy_wh"]:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors="coerce")
-            return df
-        except Exception as e:
-            st.error(f"Error reading CSV: {e}")
-            return pd.DataFrame()
-    else:
-        st.warning("⚠️ No data.csv found in app/data/.")
-        return pd.DataFrame()
-
 df = load_data()
 
 if df.empty:
     st.warning("⚠️ No data available.")
     st.stop()
 
-# ---- TASK CATEGORY ----
-def categorize_task(task_id):
-    if 1 <= task_id <= 10:
-        return "Easy factual & rewriting"
-    elif 11 <= task_id <= 15:
-        return "Reasoning & quantitative"
-    elif 16 <= task_id <= 20:
-        return "Programming & debugging"
-    elif 21 <= task_id <= 25:
-        return "Harder knowledge & reasoning"
-    elif 26 <= task_id <= 30:
-        return "Advanced / creative & multi-step"
-    else:
-        return "Other"
-
-df["task_category"] = df["task_id"].apply(categorize_task)
-
 # ---- AGGREGATION ----
-agg = df.groupby(["task_category", "model", "model_size"], as_index=False).agg(
-    quality_mean=("quality", "mean"),
-    latency_mean=("latency_s", "mean"),
-    energy_mean=("energy_wh", "mean")
-).round(3)
+@st.cache_data
+def aggregate() -> pd.DataFrame:
+    data = load_data()
+    return data.groupby(["task_category", "model", "model_size"], as_index=False, observed=True).agg(
+        quality_mean=("quality", "mean"),
+        latency_mean=("latency_s", "mean"),
+        energy_mean=("energy_wh", "mean")
+    ).round(3)
 
 # ---- NORMALIZATION ----
-def normalize(series, invert=False):
-    if series.max() == series.min():
-        return np.ones_like(series)
-    n = (series - series.min()) / (series.max() - series.min())
-    return 1 - n if invert else n
+METRICS = ["quality_mean", "latency_mean", "energy_mean"]
+INVERT = np.array([False, True, True])  # lower latency and energy are better
+
+def normalize(agg: pd.DataFrame) -> np.ndarray:
+    # Min-max scaling within each task category; INVERT columns are flipped
+    grouped = agg.groupby("task_category", observed=True)[METRICS]
+    lo = grouped.transform("min").to_numpy()
+    span = grouped.transform("max").to_numpy() - lo
+    n = np.divide(agg[METRICS].to_numpy() - lo, span, out=np.zeros_like(lo), where=span > 0)
+    n = np.where(INVERT, 1.0 - n, n)
+    return np.where(span > 0, n, 1.0).T
 
 # ---- WEIGHTING SYSTEM ----
 st.sidebar.header("⚙️ Criteria Weights")
@@ -115,17 +90,30 @@ if total_weight > 1.001:
     st.stop()
 
 # ---- SCORE CALCULATION ----
-agg["score"] = (
-    w_quality * normalize(agg["quality_mean"]) +
-    w_latency * normalize(agg["latency_mean"], invert=True) +
-    w_energy * normalize(agg["energy_mean"], invert=True)
-).round(3)
+@st.cache_data
+def normalized_metrics() -> np.ndarray:
+    # Weight-independent, so normalized once: rows are quality, latency, energy
+    return normalize(aggregate())
+
+@st.cache_data(max_entries=64)
+def compute_agg(w_q: float, w_l: float, w_e: float) -> pd.DataFrame:
+    agg = aggregate()
+    weights = np.array([w_q, w_l, w_e], dtype=np.float32)
+    agg["score"] = np.round(weights @ normalized_metrics(), 3)
+    return agg
+
+@st.cache_data(max_entries=64)
+def ranking_csv(w_q: float, w_l: float, w_e: float) -> bytes:
+    return compute_agg(w_q, w_l, w_e).to_csv(index=False).encode("utf-8")
+
+agg = compute_agg(w_quality, w_latency, w_energy)
 
 # ---- RANKING DISPLAY ----
 st.subheader("🏆 Best Model per Task Category")
 
-for cat in agg["task_category"].unique():
-    sub = agg[agg["task_category"] == cat].sort_values("score", ascending=False)
+agg_sorted = agg.sort_values(["task_category", "score"], ascending=[True, False])
+
+for cat, sub in agg_sorted.groupby("task_category", observed=True, sort=False):
     best = sub.iloc[0]
 
     st.markdown(f"### 🎯 {cat}")
@@ -145,10 +133,9 @@ for cat in agg["task_category"].unique():
         y="model",
         color="model_size",
         orientation="h",
-        title=f"Top 5 Models for {cat}",
-        text="score"
+        title=f"Top 5 Models for {cat}"
     )
-    fig.update_traces(texttemplate="%{text:.3f}", textposition="outside", marker_line_width=0)
+    fig.update_traces(texttemplate="%{x:.3f}", textposition="outside", marker_line_width=0)
     fig.update_layout(yaxis_categoryorder="total ascending", height=400)
     st.plotly_chart(fig, use_container_width=True)
 
@@ -160,7 +147,7 @@ for cat in agg["task_category"].unique():
 # ---- EXPORT ----
 st.download_button(
     "📤 Export full ranking (CSV)",
-    agg.to_csv(index=False).encode("utf-8"),
+    ranking_csv(w_quality, w_latency, w_energy),
     "ranking_by_use_case.csv",
     "text/csv",
     key="download-usecase"